@@ -43,10 +43,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'zookeeper.middleware.StaticAssetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'zookeeper.middleware.TenantMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -83,6 +85,33 @@ DATABASES = {
 }
 
 
+# Caches, sessions and authentication
+# The local-memory cache is per process; point CACHES at Redis/Memcached when
+# running several workers so session and user-cache invalidation is shared.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# 'cached_db' serves sessions from the cache and only falls back to the
+# django_session table on a miss; 'signed_cookies' avoids server storage.
+SESSION_ENGINE = os.environ.get('ZOO_SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+
+# Serves the request user from the cache instead of one query per request
+AUTHENTICATION_BACKENDS = ['zookeeper.auth.CachedModelBackend']
+ZOO_USER_CACHE_TTL = int(os.environ.get('ZOO_USER_CACHE_TTL', 60))
+
+# Per-user set of owned animal ids used for edit/feed permission checks
+ZOO_OWNED_IDS_CACHE_TTL = int(os.environ.get('ZOO_OWNED_IDS_CACHE_TTL', 300))
+
+# Multi-zoo tenancy: requests are matched to a Zoo by host name; unknown
+# hosts (and code running outside a request) use the default zoo.
+ZOO_DEFAULT_TENANT = os.environ.get('ZOO_DEFAULT_TENANT', 'default')
+ZOO_TENANT_CACHE_TTL = int(os.environ.get('ZOO_TENANT_CACHE_TTL', 300))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -118,9 +147,22 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = 'static/'
-STATICFILES_DIRS = [
-    os.path.join(BASE_DIR, 'static'),
-]
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+# App stylesheets live in zookeeper/static and are found by the app-directories finder
+
+# Outside DEBUG, collectstatic writes content-hashed names plus .gz/.br variants
+# and StaticAssetMiddleware serves them with far-future immutable caching.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'zookeeper.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -0,0 +1,46 @@
+"""
+Production settings profile for proj.
+
+Use with DJANGO_SETTINGS_MODULE=proj.settings_production. Builds on the
+development settings and turns on the cached template loader, response
+compression and the hashed/pre-compressed static pipeline.
+"""
+
+import copy
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE, STORAGES, TEMPLATES
+
+# Work on copies: editing the imported lists/dicts in place would leak these
+# changes into proj.settings for anything else importing it in this process
+MIDDLEWARE = [*MIDDLEWARE]
+STORAGES = copy.deepcopy(STORAGES)
+TEMPLATES = copy.deepcopy(TEMPLATES)
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)  # noqa: F405
+ALLOWED_HOSTS = [h for h in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',') if h]
+
+STORAGES['staticfiles']['BACKEND'] = 'zookeeper.storage.CompressedManifestStaticFilesStorage'
+
+# Compiled templates are kept in memory for the life of the process
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Compress rendered pages; static files are already pre-compressed, so this
+# sits after StaticAssetMiddleware and only sees dynamic responses.
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('zookeeper.middleware.StaticAssetMiddleware') + 1,
+    'zookeeper.middleware.CompressionMiddleware',
+)
+ZOO_COMPRESS_MIN_SIZE = 500
+
+# Parse every Zoo/*.html template when the app loads (see ZookeeperConfig.ready)
+ZOO_PRECOMPILE_TEMPLATES = True
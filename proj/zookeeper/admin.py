@@ -1,19 +1,187 @@
-from django.contrib import admin
-from .models import Species, Animal, Enclosure
+from datetime import timedelta
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.http import HttpResponseRedirect
+from django.shortcuts import redirect
+from django.utils import timezone
+from .models import Species, Animal, ConcurrentUpdateError, Enclosure, Zoo
+from .paginator import EstimatedCountPaginator
+from .relocation import rebalance_animals
+from .views import BULK_MOVE_SESSION_KEY
+
+
+class NeedsFeedingFilter(admin.SimpleListFilter):
+    title = "feeding"
+    parameter_name = "hungry"
+
+    def lookups(self, request, model_admin):
+        return (("yes", "Needs feeding"), ("no", "Fed in the last 24h"))
+
+    def queryset(self, request, queryset):
+        # Same rule as Animal.needs_feeding, expressed as one WHERE clause
+        fed_recently = Q(last_fed_at__gt=timezone.now() - timedelta(hours=24))
+        if self.value() == "yes":
+            return queryset.exclude(fed_recently)
+        if self.value() == "no":
+            return queryset.filter(fed_recently)
+        return queryset
+
+
+class ZooScopedAdmin(admin.ModelAdmin):
+    """Objects added through the admin belong to the zoo serving the request."""
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.zoo = request.zoo
+        super().save_model(request, obj, form, change)
+
+
+class ArchiveOnDeleteAdmin(ZooScopedAdmin):
+    """
+    Admin delete view and "delete selected" archive instead of running the
+    CASCADE collector, like ArchiveOnDeleteMixin in views.py.
+    `archive_animals_by` names the Animal field whose animals are archived too.
+    """
+    archive_animals_by = None
+
+    def get_deleted_objects(self, objs, request):
+        # Only the selected rows (and their animals) are touched; skip the collector
+        objs = list(objs)
+        opts = self.model._meta
+        perms_needed = set() if self.has_delete_permission(request) else {opts.verbose_name}
+        return [str(obj) for obj in objs], {opts.verbose_name_plural: len(objs)}, perms_needed, []
+
+    def delete_model(self, request, obj):
+        obj.archive()
+
+    def delete_queryset(self, request, queryset):
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(queryset.values_list("pk", flat=True))
+            self.model.objects.filter(pk__in=ids).update(archived_at=now)
+            Animal.objects.filter(**{f"{self.archive_animals_by}__in": ids}).archive(now)
+
+
+@admin.register(Zoo)
+class ZooAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "domain")
+    search_fields = ("^name", "^slug", "^domain")
+    prepopulated_fields = {"slug": ("name",)}
 
 @admin.register(Species)
-class SpeciesAdmin(admin.ModelAdmin):
+class SpeciesAdmin(ArchiveOnDeleteAdmin):
+    archive_animals_by = "species"
     list_display = ("name", "diet")
-    search_fields = ("name",)
+    list_filter = ("diet",)
+    search_fields = ("^name",)
 
 @admin.register(Enclosure)
-class EnclosureAdmin(admin.ModelAdmin):
-    list_display = ("name", "diet_type", "capacity", "current_occupancy", "created_at")
+class EnclosureAdmin(ArchiveOnDeleteAdmin):
+    archive_animals_by = "enclosure"
+    list_display = ("name", "diet_type", "capacity", "occupancy", "created_at")
     list_filter = ("diet_type", "created_at")
-    search_fields = ("name",)
+    search_fields = ("^name",)
+    actions = ["rebalance_contents"]
+
+    def get_queryset(self, request):
+        # One grouped query instead of a COUNT per changelist row
+        return super().get_queryset(request).annotate(
+            occupancy=Count("animal", filter=Q(animal__archived_at__isnull=True))
+        )
+
+    @admin.display(description="Occupancy", ordering="occupancy")
+    def occupancy(self, obj):
+        return f"{obj.occupancy}/{obj.capacity}"
+
+    @admin.action(description="Rebalance animals of selected enclosures", permissions=["change"])
+    def rebalance_contents(self, request, queryset):
+        try:
+            placed = rebalance_animals(Animal.objects.filter(enclosure__in=queryset))
+        except ValidationError as e:
+            self.message_user(request, "; ".join(e.messages), messages.ERROR)
+            return
+        self.message_user(request, f"Rebalanced {sum(placed.values())} animals across {len(placed)} enclosures.")
+
+class AnimalAdminForm(forms.ModelForm):
+    class Meta:
+        model = Animal
+        fields = "__all__"
+        # Carries the version the change form was opened at, not editable
+        widgets = {"version": forms.HiddenInput}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        # The admin reloads the animal on POST; compare against the version the user saw
+        if self.instance.pk and cleaned_data.get("version") != self.instance.version:
+            raise ValidationError("This animal was changed by someone else while you were editing. "
+                                  "Reload the page to see the latest version.")
+        return cleaned_data
+
 
 @admin.register(Animal)
-class AnimalAdmin(admin.ModelAdmin):
+class AnimalAdmin(ArchiveOnDeleteAdmin):
     list_display = ("name", "species", "enclosure", "owner", "last_fed_at", "created_at")
-    list_filter = ("species", "enclosure", "created_at")
-    search_fields = ("name",)
\ No newline at end of file
+    list_select_related = ("species", "enclosure", "owner")
+    # Species/enclosure lists grow with the zoo; filter by diet and search by name instead.
+    # ^ and = are served by the UPPER(name) pattern indexes (migration 0017) on PostgreSQL
+    list_filter = ("species__diet", NeedsFeedingFilter, "created_at")
+    search_fields = ("^name", "=species__name", "=enclosure__name")
+    autocomplete_fields = ("species", "enclosure", "owner")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["mark_fed", "move_selected", "rebalance_selected"]
+    form = AnimalAdminForm
+
+    def delete_queryset(self, request, queryset):
+        queryset.archive()
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Same versioned write as AnimalUpdateView: only the edited fields,
+        # and only if nobody saved since the form was opened
+        changed = [name for name in form.changed_data if name != "version"]
+        if changed:
+            try:
+                obj.save_versioned(changed)
+            except ConcurrentUpdateError:
+                # Lost the race after AnimalAdminForm.clean; nothing was written
+                request.animal_conflict = True
+                self.message_user(request, "This animal was changed by someone else while you were editing. "
+                                           "Your changes were not saved.", messages.ERROR)
+
+    def log_change(self, request, obj, message):
+        if not getattr(request, "animal_conflict", False):
+            return super().log_change(request, obj, message)
+
+    def response_change(self, request, obj):
+        if getattr(request, "animal_conflict", False):
+            # Back to the change form showing the latest version, without the success message
+            return HttpResponseRedirect(request.path)
+        return super().response_change(request, obj)
+
+    @admin.action(description="Mark selected animals as fed", permissions=["change"])
+    def mark_fed(self, request, queryset):
+        now = timezone.now()
+        updated = queryset.update(
+            previous_fed_at=F("last_fed_at"), last_fed_at=now, updated_at=now, version=F("version") + 1
+        )
+        self.message_user(request, f"Marked {updated} animals as fed.")
+
+    @admin.action(description="Move selected animals to an enclosure", permissions=["change"])
+    def move_selected(self, request, queryset):
+        request.session[BULK_MOVE_SESSION_KEY] = list(queryset.values_list("pk", flat=True))
+        return redirect("animal_bulk_move")
+
+    @admin.action(description="Rebalance selected animals across enclosures", permissions=["change"])
+    def rebalance_selected(self, request, queryset):
+        try:
+            placed = rebalance_animals(queryset)
+        except ValidationError as e:
+            self.message_user(request, "; ".join(e.messages), messages.ERROR)
+            return
+        self.message_user(request, f"Rebalanced {sum(placed.values())} animals across {len(placed)} enclosures.")
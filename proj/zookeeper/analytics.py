@@ -0,0 +1,181 @@
+# proj/zookeeper/analytics.py
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Animal, Enclosure, EnclosureSnapshot, RollupWatermark, SpeciesFeedingRollup
+from .tenancy import use_zoo
+
+WATERMARK = 'animals'
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+HUNGRY_AFTER = timedelta(hours=24)
+# updated_at is stamped before commit, so a write can become visible after a
+# refresh has read past it; only read up to now - COMMIT_LAG and let the
+# next refresh pick up the rest
+COMMIT_LAG = timedelta(minutes=1)
+
+
+def _hour(when):
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+def refresh_rollups(now=None):
+    """
+    Bring the rollup tables up to `now` - COMMIT_LAG and advance the
+    watermark to that point. Always covers every zoo in one pass.
+
+    Feeds are read incrementally: only animals updated since the watermark
+    whose last_fed_at is newer than it, so each animal contributes at most
+    one feed per refresh, counted in the hour it happened. Occupancy and hungry counts are point-in-time
+    state (hunger changes with the clock, not with writes), so they come
+    from one grouped COUNT per refresh and land on the current hour's row.
+    Returns the number of changed animals processed.
+    """
+    now = now or timezone.now()
+    hour = _hour(now)
+    until = now - COMMIT_LAG
+
+    # The watermark is global, so never refresh through one zoo's scope
+    with use_zoo(None), transaction.atomic():
+        mark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+            name=WATERMARK, defaults={'processed_until': EPOCH}
+        )
+        since = mark.processed_until
+
+        changed = list(
+            Animal.objects.filter(updated_at__gt=since, updated_at__lte=until, last_fed_at__gt=since)
+            .values_list('zoo_id', 'enclosure_id', 'species_id', 'last_fed_at', 'previous_fed_at')
+        )
+        enclosure_feeds = {}
+        species_feeds = {}
+        species_zoo = {}
+        for zoo_id, enclosure_id, species_id, fed_at, previous in changed:
+            fed_hour = _hour(fed_at)
+            enclosure_feeds[(enclosure_id, fed_hour)] = enclosure_feeds.get((enclosure_id, fed_hour), 0) + 1
+            species_zoo[species_id] = zoo_id
+            feeds, intervals, seconds = species_feeds.get((species_id, fed_hour), (0, 0, 0.0))
+            if previous:
+                intervals += 1
+                seconds += (fed_at - previous).total_seconds()
+            species_feeds[(species_id, fed_hour)] = (feeds + 1, intervals, seconds)
+
+        counts = {
+            row['enclosure']: row
+            for row in Animal.objects.values('enclosure').annotate(
+                occupancy=Count('pk'),
+                hungry=Count('pk', filter=Q(last_fed_at__isnull=True) | Q(last_fed_at__lte=now - HUNGRY_AFTER)),
+            )
+        }
+        existing = dict(
+            EnclosureSnapshot.objects.filter(hour=hour).values_list('enclosure_id', 'feeds')
+        )
+        EnclosureSnapshot.objects.bulk_create(
+            [
+                EnclosureSnapshot(
+                    zoo_id=zoo_id, enclosure_id=pk, hour=hour, diet_type=diet_type, capacity=capacity,
+                    occupancy=counts.get(pk, {}).get('occupancy', 0),
+                    hungry=counts.get(pk, {}).get('hungry', 0),
+                    feeds=existing.get(pk, 0) + enclosure_feeds.pop((pk, hour), 0),
+                )
+                for pk, zoo_id, diet_type, capacity in Enclosure.objects.values_list('pk', 'zoo_id', 'diet_type', 'capacity')
+            ],
+            update_conflicts=True,
+            unique_fields=['enclosure', 'hour'],
+            update_fields=['diet_type', 'capacity', 'occupancy', 'hungry', 'feeds'],
+        )
+
+        if enclosure_feeds:
+            # Feeds from earlier hours go onto that hour's snapshot. If the hour
+            # has no snapshot yet, the new row has zero capacity and occupancy,
+            # so it does not change the occupancy percentages.
+            earlier = {
+                (enclosure_id, fed_hour): feeds
+                for enclosure_id, fed_hour, feeds in EnclosureSnapshot.objects.filter(
+                    enclosure_id__in={e for e, _ in enclosure_feeds},
+                    hour__in={h for _, h in enclosure_feeds},
+                ).values_list('enclosure_id', 'hour', 'feeds')
+            }
+            enclosures = {
+                pk: (zoo_id, diet_type)
+                for pk, zoo_id, diet_type in Enclosure.all_objects.filter(
+                    pk__in={e for e, _ in enclosure_feeds}
+                ).values_list('pk', 'zoo_id', 'diet_type')
+            }
+            EnclosureSnapshot.objects.bulk_create(
+                [
+                    EnclosureSnapshot(
+                        zoo_id=enclosures[pk][0], enclosure_id=pk, hour=fed_hour, diet_type=enclosures[pk][1],
+                        capacity=0, feeds=earlier.get((pk, fed_hour), 0) + feeds,
+                    )
+                    for (pk, fed_hour), feeds in enclosure_feeds.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['enclosure', 'hour'],
+                update_fields=['feeds'],
+            )
+
+        if species_feeds:
+            previous_rows = {
+                (species_id, fed_hour): (feeds, intervals, seconds)
+                for species_id, fed_hour, feeds, intervals, seconds in SpeciesFeedingRollup.objects.filter(
+                    species_id__in={s for s, _ in species_feeds},
+                    hour__in={h for _, h in species_feeds},
+                ).values_list('species_id', 'hour', 'feeds', 'intervals', 'interval_seconds')
+            }
+            rollups = []
+            for key, (feeds, intervals, seconds) in species_feeds.items():
+                old_feeds, old_intervals, old_seconds = previous_rows.get(key, (0, 0, 0.0))
+                rollups.append(SpeciesFeedingRollup(
+                    zoo_id=species_zoo[key[0]], species_id=key[0], hour=key[1],
+                    feeds=old_feeds + feeds,
+                    intervals=old_intervals + intervals,
+                    interval_seconds=old_seconds + seconds,
+                ))
+            SpeciesFeedingRollup.objects.bulk_create(
+                rollups,
+                update_conflicts=True,
+                unique_fields=['species', 'hour'],
+                update_fields=['feeds', 'intervals', 'interval_seconds'],
+            )
+
+        mark.processed_until = until
+        mark.save(update_fields=['processed_until'])
+
+    return len(changed)
+
+
+def occupancy_by_diet(since):
+    """Hourly occupancy % per diet zone, read from the snapshot table only."""
+    rows = (
+        EnclosureSnapshot.objects.filter(hour__gte=since)
+        .values('hour', 'diet_type')
+        .annotate(
+            occupancy=Sum('occupancy'), capacity=Sum('capacity'),
+            hungry=Sum('hungry'), feeds=Sum('feeds'),
+        )
+        .order_by('hour', 'diet_type')
+    )
+    return [
+        dict(row, occupancy_pct=round(100 * row['occupancy'] / row['capacity'], 1) if row['capacity'] else 0)
+        for row in rows
+    ]
+
+
+def feeding_intervals(since):
+    """Average hours between feedings per species, read from the rollup table only."""
+    rows = (
+        SpeciesFeedingRollup.objects.filter(hour__gte=since)
+        .values('species__name')
+        .annotate(feeds=Sum('feeds'), intervals=Sum('intervals'), seconds=Sum('interval_seconds'))
+        .order_by('species__name')
+    )
+    return [
+        {
+            'species': row['species__name'],
+            'feeds': row['feeds'],
+            'avg_hours_between_feeds': round(row['seconds'] / row['intervals'] / 3600, 1) if row['intervals'] else None,
+        }
+        for row in rows
+    ]
@@ -1,5 +1,24 @@
+from pathlib import Path
+
 from django.apps import AppConfig
+from django.conf import settings
 
 class ZookeeperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'zookeeper'  # Use 'zookeeper'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (registers receivers)
+
+        if getattr(settings, 'ZOO_PRECOMPILE_TEMPLATES', False):
+            self.precompile_templates()
+
+    def precompile_templates(self):
+        """
+        Load every Zoo/*.html template once so the cached loader holds the
+        compiled versions before the first request arrives.
+        """
+        from django.template.loader import get_template
+
+        for path in sorted((Path(self.path) / 'templates' / 'Zoo').glob('*.html')):
+            get_template(f'Zoo/{path.name}')
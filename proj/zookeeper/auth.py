@@ -0,0 +1,30 @@
+# proj/zookeeper/auth.py
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = 'zookeeper:user:{}'
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose per-request user lookup is served from the cache.
+
+    AuthenticationMiddleware calls get_user() on every request; caching the
+    User for ZOO_USER_CACHE_TTL seconds removes that query. Entries are
+    dropped when a user is saved or deleted (see signals.py), so edits made
+    through UserUpdateView/UserDeleteView take effect on the next request.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, getattr(settings, 'ZOO_USER_CACHE_TTL', 60))
+        return user
@@ -3,14 +3,51 @@ from django.contrib.auth.forms import UserCreationForm, UserChangeForm
 from django.contrib.auth.models import User
 from .models import Animal, Species, Enclosure
 from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
+from django.utils.text import format_lazy
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Select that renders only the currently selected option; the rest are
+    fetched from `url` as the user types (see animal_form.html).
+    """
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = str(self.url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        # Look up the selected pk only instead of iterating the whole queryset
+        try:
+            # Re-rendering an invalid form may carry junk like "abc"; show it as unselected
+            selected = list(self.choices.queryset.filter(pk__in=[v for v in value if v]))
+        except (ValueError, TypeError, ValidationError):
+            selected = []
+        options = [self.create_option(name, '', '---------', not selected, 0)]
+        for index, obj in enumerate(selected, start=1):
+            options.append(self.create_option(name, obj.pk, str(obj), True, index))
+        return [(None, options, 0)]
+
 
 class AnimalForm(forms.ModelForm):
     class Meta:
         model = Animal
-        fields = ['name', 'species', 'enclosure']
+        # version carries the row version the user started editing from
+        fields = ['name', 'species', 'enclosure', 'version']
+        widgets = {
+            'species': AutocompleteSelect(reverse_lazy('species_autocomplete')),
+            'enclosure': AutocompleteSelect(reverse_lazy('enclosure_autocomplete')),
+            'version': forms.HiddenInput,
+        }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Rebuild per form so the tenant-aware managers scope choices to the current zoo
         self.fields['species'].queryset = Species.objects.all()
         self.fields['enclosure'].queryset = Enclosure.objects.all()
 
@@ -28,12 +65,26 @@ class AnimalForm(forms.ModelForm):
                 )
             
             # Check if the enclosure is full
-            if enclosure.is_full and (not self.instance or self.instance.enclosure != enclosure):
+            if enclosure.is_full and self.instance.enclosure_id != enclosure.pk:
                 raise ValidationError(f"This enclosure is already at full capacity ({enclosure.capacity} animals)")
         
         return cleaned_data
 
-class SpeciesForm(forms.ModelForm):
+class UniqueActiveNameMixin:
+    """
+    Name uniqueness is a conditional (per zoo, unarchived) constraint on
+    fields the form does not edit, so model validation skips it; check it
+    here against the active, tenant-scoped manager instead.
+    """
+
+    def clean_name(self):
+        name = self.cleaned_data['name']
+        model = self._meta.model
+        if model.objects.filter(name=name).exclude(pk=self.instance.pk).exists():
+            raise ValidationError(f"{model._meta.verbose_name.capitalize()} with this Name already exists.")
+        return name
+
+class SpeciesForm(UniqueActiveNameMixin, forms.ModelForm):
     class Meta:
         model = Species
         fields = ['name', 'diet']
@@ -55,7 +106,50 @@ class CustomUserChangeForm(UserChangeForm):
         fields = ['username', 'email', 'is_staff']
         exclude = ['password']
 
-class EnclosureForm(forms.ModelForm):
+class EnclosureForm(UniqueActiveNameMixin, forms.ModelForm):
     class Meta:
         model = Enclosure
         fields = ['name', 'description', 'capacity', 'diet_type']
+
+class BulkMoveForm(forms.Form):
+    # The roster can be huge: animals come from the admin selection (kept
+    # server-side, see AnimalBulkMoveView), enclosures from the autocomplete endpoint
+    use_selection = forms.BooleanField(required=False)
+    source = forms.ModelChoiceField(
+        queryset=Enclosure.objects.all(), required=False, label='From enclosure',
+        widget=AutocompleteSelect(format_lazy('{}?any=1', reverse_lazy('enclosure_autocomplete'))),
+        help_text="Move every animal currently in this enclosure.")
+    target = forms.ModelChoiceField(
+        queryset=Enclosure.objects.all(), required=False, label='To enclosure',
+        widget=AutocompleteSelect(reverse_lazy('enclosure_autocomplete')))
+    rebalance = forms.BooleanField(
+        required=False, label='Auto-rebalance',
+        help_text="Spread the animals across all compatible enclosures by remaining capacity; ignores the target.")
+
+    def __init__(self, *args, selection=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selection = list(selection)
+        if self.selection:
+            self.fields['use_selection'].label = f"Move the {len(self.selection)} animals selected in the admin"
+            self.fields['use_selection'].initial = True
+            self.fields['use_selection'].help_text = "Untick to move a whole enclosure instead."
+        else:
+            del self.fields['use_selection']
+        self.fields['source'].queryset = Enclosure.objects.all()
+        self.fields['target'].queryset = Enclosure.objects.all()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        source = cleaned_data.get('source')
+
+        if not cleaned_data.get('use_selection') and not source:
+            raise ValidationError("Select some animals or a source enclosure")
+        if not cleaned_data.get('rebalance') and not cleaned_data.get('target'):
+            raise ValidationError("Select a target enclosure or choose auto-rebalance")
+
+        return cleaned_data
+
+    def get_animals(self):
+        if self.cleaned_data.get('use_selection'):
+            return Animal.objects.filter(pk__in=self.selection)
+        return Animal.objects.filter(enclosure=self.cleaned_data['source'])
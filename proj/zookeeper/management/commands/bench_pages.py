@@ -0,0 +1,71 @@
+import gzip
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from zookeeper.models import Animal, Enclosure, Species
+from zookeeper.tenancy import default_zoo
+
+PAGES = ['animals_list', 'zoo_map', 'animal_create', 'admin_dashboard', 'analytics_dashboard']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Report bytes sent (plain, gzip, and to clients accepting br) and render CPU per page under the active settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help="Requests per page")
+        parser.add_argument('--seed', type=int, default=0, help="Add this many animals first (rolled back)")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user('bench-pages', password='bench', is_staff=True)
+                if options['seed']:
+                    self._seed(user, options['seed'])
+                client = Client()
+                client.force_login(user)
+                self.stdout.write(f"{'page':<22}{'plain':>10}{'gzip':>10}{'br':>10}{'cpu ms':>10}")
+                for name in PAGES:
+                    self._bench(client, reverse(name), name, options['requests'])
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            teardown_test_environment()
+
+    def _seed(self, user, count):
+        # The test client's host resolves to the default zoo
+        zoo = default_zoo()
+        species = Species.objects.create(zoo=zoo, name='bench-species', diet='herbivore')
+        enclosure = Enclosure.objects.create(zoo=zoo, name='bench-enclosure', diet_type='herbivore', capacity=count)
+        Animal.objects.bulk_create(
+            Animal(zoo=zoo, owner=user, name=f'bench-{i}', species=species, enclosure=enclosure)
+            for i in range(count)
+        )
+
+    def _bench(self, client, url, name, n):
+        sizes = {}
+        for label, accept in (('plain', ''), ('gzip', 'gzip'), ('br', 'br, gzip')):
+            response = client.get(url, HTTP_ACCEPT_ENCODING=accept)
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            sizes[label] = len(body)
+        if sizes['gzip'] == sizes['plain']:
+            # Compression middleware not active; show what it would save
+            plain = client.get(url).content
+            sizes['gzip'] = f"({len(gzip.compress(plain))})"
+
+        start = time.process_time()
+        for _ in range(n):
+            client.get(url)
+        cpu = (time.process_time() - start) / n * 1000
+        self.stdout.write(f"{name:<22}{sizes['plain']:>10}{sizes['gzip']:>10}{sizes['br']:>10}{cpu:>10.2f}")
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+CONFIGS = [
+    ('db sessions + ModelBackend',
+     'django.contrib.sessions.backends.db', 'django.contrib.auth.backends.ModelBackend'),
+    ('cached_db sessions + CachedModelBackend',
+     'django.contrib.sessions.backends.cached_db', 'zookeeper.auth.CachedModelBackend'),
+    ('signed_cookies sessions + CachedModelBackend',
+     'django.contrib.sessions.backends.signed_cookies', 'zookeeper.auth.CachedModelBackend'),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare DB queries and latency per request for each session/auth configuration."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Requests per configuration")
+        parser.add_argument('--url', default=None, help="Page to request (defaults to the animal list)")
+
+    def handle(self, *args, **options):
+        url = options['url'] or reverse('animals_list')
+        setup_test_environment()
+        try:
+            # Everything (bench user, sessions) is rolled back at the end
+            with transaction.atomic():
+                user = User.objects.create_user('bench-session-auth', password='bench')
+                for label, engine, backend in CONFIGS:
+                    self._run(label, engine, backend, user, url, options['requests'])
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            teardown_test_environment()
+
+    def _run(self, label, engine, backend, user, url, n):
+        cache.clear()
+        with override_settings(SESSION_ENGINE=engine, AUTHENTICATION_BACKENDS=[backend]):
+            client = Client()
+            client.force_login(user, backend=backend)
+            client.get(url)  # warm caches
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                for _ in range(n):
+                    client.get(url)
+                elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:<46} {len(ctx.captured_queries) / n:5.1f} queries/request  "
+            f"{elapsed / n * 1000:6.2f} ms/request"
+        )
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+
+FIRST_REQUEST = """
+import os, time
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', {settings!r})
+import django
+django.setup()
+from django.test import Client
+from django.test.utils import setup_test_environment
+setup_test_environment()
+Client().get('/accounts/login/')
+print(time.perf_counter() - t0)
+"""
+
+
+class Command(BaseCommand):
+    help = "Time `manage.py check`, test database creation and the first request of a cold process."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help="Repetitions per measurement (best is reported)")
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        self.report_plan()
+        self.report("manage.py check", [self.time_check() for _ in range(runs)])
+        self.report("test database creation", [self.time_test_db() for _ in range(runs)])
+        self.report("cold first request", [self.time_first_request() for _ in range(runs)])
+
+    def report_plan(self):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        plan = MigrationExecutor(connection).migration_plan(loader.graph.leaf_nodes(), clean_start=True)
+        zoo = [m for m, _ in plan if m.app_label == 'zookeeper']
+        self.stdout.write(f"migrations for a fresh database: {len(plan)} ({len(zoo)} zookeeper)")
+
+    def report(self, label, timings):
+        self.stdout.write(f"{label:<26} best {min(timings) * 1000:8.1f} ms   worst {max(timings) * 1000:8.1f} ms")
+
+    def time_check(self):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'manage.py', 'check'], check=True, capture_output=True,
+                       cwd=settings.BASE_DIR)
+        return time.perf_counter() - start
+
+    def time_test_db(self):
+        creation = connection.creation
+        original = connection.settings_dict['NAME']
+        start = time.perf_counter()
+        test_name = creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        elapsed = time.perf_counter() - start
+        creation.destroy_test_db(original, verbosity=0)
+        assert test_name != original
+        return elapsed
+
+    def time_first_request(self):
+        script = FIRST_REQUEST.format(settings=settings.SETTINGS_MODULE)
+        result = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True,
+                                text=True, cwd=settings.BASE_DIR)
+        return float(result.stdout.strip().splitlines()[-1])
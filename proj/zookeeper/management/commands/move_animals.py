@@ -0,0 +1,56 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from zookeeper.models import Animal, Enclosure, Zoo
+from zookeeper.relocation import relocate_animals, rebalance_animals
+from zookeeper.tenancy import use_zoo
+
+
+class Command(BaseCommand):
+    help = "Move a set of animals, or a whole enclosure's contents, in one transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zoo', required=True, help="Slug of the zoo whose animals and enclosures to use")
+        parser.add_argument('--animals', nargs='+', type=int, default=[], help="Animal ids to move")
+        parser.add_argument('--from', dest='source', help="Move every animal in this enclosure (by name)")
+        parser.add_argument('--to', dest='target', help="Target enclosure (by name)")
+        parser.add_argument('--rebalance', action='store_true',
+                            help="Spread the animals across compatible enclosures by remaining capacity")
+
+    def _enclosure(self, name):
+        try:
+            return Enclosure.objects.get(name=name)
+        except Enclosure.DoesNotExist:
+            raise CommandError(f"Enclosure '{name}' does not exist")
+
+    def handle(self, *args, **options):
+        try:
+            zoo = Zoo.objects.get(slug=options['zoo'])
+        except Zoo.DoesNotExist:
+            raise CommandError(f"Zoo '{options['zoo']}' does not exist")
+        # Commands run unscoped; look up names and ids in this zoo only
+        with use_zoo(zoo):
+            self.move(options)
+
+    def move(self, options):
+        if options['animals']:
+            animals = Animal.objects.filter(pk__in=options['animals'])
+        elif options['source']:
+            animals = Animal.objects.filter(enclosure=self._enclosure(options['source']))
+        else:
+            raise CommandError("Pass --animals or --from")
+
+        try:
+            if options['rebalance']:
+                placed = rebalance_animals(animals)
+                for enclosure, count in placed.items():
+                    self.stdout.write(f"{enclosure.name}: {count}")
+                moved = sum(placed.values())
+            elif options['target']:
+                moved = relocate_animals(animals, self._enclosure(options['target']))
+            else:
+                raise CommandError("Pass --to or --rebalance")
+        except ValidationError as e:
+            raise CommandError("; ".join(e.messages))
+
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} animals"))
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from zookeeper.models import Animal, Enclosure, EnclosureSnapshot, Species, SpeciesFeedingRollup
+
+
+class Command(BaseCommand):
+    help = "Delete archived animals, enclosures, species and users in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows per DELETE")
+        parser.add_argument('--older-than-hours', type=int, default=0,
+                            help="Only purge rows archived at least this long ago")
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        cutoff = timezone.now() - timedelta(hours=options['older_than_hours'])
+        q = connection.ops.quote_name
+        animal, enclosure, species = (q(m._meta.db_table) for m in (Animal, Enclosure, Species))
+
+        # Animals first, so the parents below no longer have children.
+        # Archiving a parent archived its animals too (see Model.archive()).
+        self.purge(Animal, "archived_at IS NOT NULL AND archived_at <= %s", [cutoff])
+        self.purge(EnclosureSnapshot,
+                   f"enclosure_id IN (SELECT id FROM {enclosure} WHERE archived_at <= %s)", [cutoff])
+        self.purge(SpeciesFeedingRollup,
+                   f"species_id IN (SELECT id FROM {species} WHERE archived_at <= %s)", [cutoff])
+        self.purge(Enclosure, f"archived_at <= %s AND NOT EXISTS "
+                              f"(SELECT 1 FROM {animal} WHERE {animal}.enclosure_id = {enclosure}.id)", [cutoff])
+        self.purge(Species, f"archived_at <= %s AND NOT EXISTS "
+                            f"(SELECT 1 FROM {animal} WHERE {animal}.species_id = {species}.id)", [cutoff])
+
+        # Few rows, but auth relations (groups, permissions, admin log) need the ORM collector
+        users = User.objects.filter(zoo_archive__archived_at__lte=cutoff, animal__isnull=True)
+        deleted = 0
+        for user in users.iterator():
+            with transaction.atomic():
+                user.delete()
+            deleted += 1
+        self.stdout.write(f"{User._meta.verbose_name_plural}: {deleted}")
+        self.stdout.write(self.style.SUCCESS("Purge complete"))
+
+    def purge(self, model, where, params):
+        """Run `DELETE ... WHERE id IN (SELECT id ... LIMIT n)` until nothing matches."""
+        table = connection.ops.quote_name(model._meta.db_table)
+        sql = f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} WHERE {where} LIMIT %s)"
+        total = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [*params, self.batch_size])
+                deleted = cursor.rowcount
+            total += deleted
+            if deleted < self.batch_size:
+                break
+        self.stdout.write(f"{model._meta.verbose_name_plural}: {total}")
+        return total
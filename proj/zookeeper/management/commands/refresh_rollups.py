@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from zookeeper.analytics import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Refresh the occupancy/feeding rollup tables from animals changed since the last run."
+
+    def handle(self, *args, **options):
+        processed = refresh_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} changed animals"))
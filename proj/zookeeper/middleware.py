@@ -0,0 +1,122 @@
+# proj/zookeeper/middleware.py
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+from .tenancy import default_zoo, use_zoo
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=60'
+
+# Preferred first; matched against the request's Accept-Encoding
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticAssetMiddleware:
+    """
+    Serve collected static files from STATIC_ROOT.
+
+    Picks the pre-compressed .br/.gz variant the client accepts, and marks
+    content-hashed names (from the staticfiles manifest) as immutable for a
+    year so browsers never revalidate them. Disabled when DEBUG is on, where
+    runserver's staticfiles handler serves the source files instead.
+    """
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.root = str(settings.STATIC_ROOT)
+        self.hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        content_type, _ = mimetypes.guess_type(path)
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+            filename=os.path.basename(name),
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if name in self.hashed else REVALIDATE_CACHE_CONTROL
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that skips bodies under ZOO_COMPRESS_MIN_SIZE bytes.
+
+    Dynamic pages are gzip-only on purpose: GZipMiddleware pads its output
+    with random bytes to blunt BREACH against the CSRF tokens in our forms,
+    and brotli has no equivalent. Brotli is still served for the pre-built
+    static files (see StaticAssetMiddleware).
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'ZOO_COMPRESS_MIN_SIZE', 200)
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        return super().process_response(request, response)
+
+
+TENANT_HOST_CACHE_KEY = 'zookeeper:zoo-host:{}'
+
+
+class TenantMiddleware:
+    """
+    Resolve the zoo for this request from the Host header (Zoo.domain),
+    falling back to ZOO_DEFAULT_TENANT, and scope the tenant-aware managers
+    to it for the rest of the request. Host lookups are cached.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.zoo = self.resolve(request.get_host().split(':')[0].lower())
+        with use_zoo(request.zoo):
+            return self.get_response(request)
+
+    def resolve(self, host):
+        from .models import Zoo
+
+        key = TENANT_HOST_CACHE_KEY.format(host)
+        zoo = cache.get(key)
+        if zoo is None:
+            zoo = Zoo.objects.filter(domain=host).first() or default_zoo()
+            cache.set(key, zoo, getattr(settings, 'ZOO_TENANT_CACHE_TTL', 300))
+        return zoo
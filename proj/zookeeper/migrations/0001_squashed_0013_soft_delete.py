@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    replaces = [('zookeeper', '0001_initial'), ('zookeeper', '0002_alter_animal_last_fed_at_alter_species_diet_and_more'), ('zookeeper', '0003_enclosure_alter_species_options_and_more'), ('zookeeper', '0004_alter_animal_enclosure'), ('zookeeper', '0005_create_enclosures'), ('zookeeper', '0007_create_enclosures'), ('zookeeper', '0006_alter_animal_enclosure'), ('zookeeper', '0008_merge_20251101_1535'), ('zookeeper', '0009_animal_search_indexes'), ('zookeeper', '0010_analytics_rollups'), ('zookeeper', '0011_animal_owner_name_index'), ('zookeeper', '0012_animal_version'), ('zookeeper', '0013_soft_delete')]
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Species',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('diet', models.CharField(choices=[('herbivore', 'Herbivore'), ('carnivore', 'Carnivore'), ('omnivore', 'Omnivore')], max_length=20)),
+                ('archived_at', models.DateTimeField(blank=True, db_index=True, editable=False, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Species',
+            },
+        ),
+        migrations.CreateModel(
+            name='Enclosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('capacity', models.PositiveIntegerField(default=1)),
+                ('diet_type', models.CharField(choices=[('herbivore', 'Herbivore'), ('carnivore', 'Carnivore'), ('omnivore', 'Omnivore')], help_text='Preferred diet type for this enclosure', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('archived_at', models.DateTimeField(blank=True, db_index=True, editable=False, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('processed_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EnclosureSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('diet_type', models.CharField(choices=[('herbivore', 'Herbivore'), ('carnivore', 'Carnivore'), ('omnivore', 'Omnivore')], max_length=20)),
+                ('capacity', models.PositiveIntegerField()),
+                ('occupancy', models.PositiveIntegerField(default=0)),
+                ('hungry', models.PositiveIntegerField(default=0)),
+                ('feeds', models.PositiveIntegerField(default=0)),
+                ('enclosure', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='zookeeper.enclosure')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour', 'diet_type'], name='zookeeper_e_hour_64d093_idx')],
+                'constraints': [models.UniqueConstraint(fields=('enclosure', 'hour'), name='unique_enclosure_snapshot_hour')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SpeciesFeedingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('feeds', models.PositiveIntegerField(default=0)),
+                ('intervals', models.PositiveIntegerField(default=0)),
+                ('interval_seconds', models.FloatField(default=0)),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feeding_rollups', to='zookeeper.species')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('species', 'hour'), name='unique_species_rollup_hour')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('archived_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Animal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=100)),
+                ('enclosure', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='zookeeper.enclosure')),
+                ('last_fed_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='zookeeper.species')),
+                ('previous_fed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(blank=True, db_index=True, editable=False, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'name'], name='zookeeper_a_owner_i_a30a4b_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='enclosure',
+            constraint=models.UniqueConstraint(condition=models.Q(('archived_at__isnull', True)), fields=('name',), name='unique_active_enclosure_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='species',
+            constraint=models.UniqueConstraint(condition=models.Q(('archived_at__isnull', True)), fields=('name',), name='unique_active_species_name'),
+        ),
+        migrations.AddField(
+            model_name='archiveduser',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='zoo_archive', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,29 +1,30 @@
 from django.db import migrations
+from django.db.models import Count, Min
 
 def create_enclosures(apps, schema_editor):
     Animal = apps.get_model('zookeeper', 'Animal')
     Enclosure = apps.get_model('zookeeper', 'Enclosure')
-    Species = apps.get_model('zookeeper', 'Species')
 
-    # Get all unique enclosure names from existing animals
-    existing_enclosures = set(Animal.objects.values_list('enclosure', flat=True))
-    
-    # Create an Enclosure object for each unique enclosure name
-    for enclosure_name in existing_enclosures:
-        # Try to guess the diet type from the animals in this enclosure
-        animals_in_enclosure = Animal.objects.filter(enclosure=enclosure_name).select_related('species')
-        diet_types = set(animal.species.diet for animal in animals_in_enclosure)
-        
-        # Use the most common diet type, or 'omnivore' if mixed
-        diet_type = list(diet_types)[0] if len(diet_types) == 1 else 'omnivore'
-        
-        # Create the enclosure
-        Enclosure.objects.create(
-            name=enclosure_name,
-            diet_type=diet_type,
-            capacity=max(3, animals_in_enclosure.count()),  # Set capacity to at least 3 or current count
-            description=f"Auto-created enclosure for {enclosure_name}"
+    # One aggregate query: animals and distinct diets per existing enclosure name
+    rows = (
+        Animal.objects.values('enclosure')
+        .annotate(
+            animals=Count('id'),
+            diets=Count('species__diet', distinct=True),
+            min_diet=Min('species__diet'),
         )
+    )
+
+    # Use the single diet type if all animals agree, or 'omnivore' if mixed
+    Enclosure.objects.bulk_create([
+        Enclosure(
+            name=row['enclosure'],
+            diet_type=row['min_diet'] if row['diets'] == 1 else 'omnivore',
+            capacity=max(3, row['animals']),  # Set capacity to at least 3 or current count
+            description=f"Auto-created enclosure for {row['enclosure']}",
+        )
+        for row in rows
+    ])
 
 def reverse_migration(apps, schema_editor):
     Enclosure = apps.get_model('zookeeper', 'Enclosure')
@@ -35,5 +36,6 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.RunPython(create_enclosures, reverse_migration),
+        # Only meaningful for databases that still hold enclosure names as text
+        migrations.RunPython(create_enclosures, reverse_migration, elidable=True),
     ]
@@ -13,17 +13,18 @@ def _map_enclosure_strings_to_ids(apps, schema_editor):
     Animal = apps.get_model('zookeeper', 'Animal')
     Enclosure = apps.get_model('zookeeper', 'Enclosure')
 
-    for animal in Animal.objects.all():
-        name = animal.enclosure
-        if not name:
-            continue
-        try:
-            enc = Enclosure.objects.get(name=name)
-        except Enclosure.DoesNotExist:
-            enc = Enclosure.objects.create(name=name, diet_type='omnivore', capacity=3, description=f'Auto-created from migration for {name}')
-        # update the charfield value to the enclosure id (string) so the subsequent
-        # AlterField to FK will find matching integer ids
-        Animal.objects.filter(pk=animal.pk).update(enclosure=str(enc.pk))
+    names = set(Animal.objects.exclude(enclosure='').values_list('enclosure', flat=True))
+    existing = dict(Enclosure.objects.filter(name__in=names).values_list('name', 'pk'))
+    Enclosure.objects.bulk_create([
+        Enclosure(name=name, diet_type='omnivore', capacity=3, description=f'Auto-created from migration for {name}')
+        for name in names - set(existing)
+    ])
+    existing = dict(Enclosure.objects.filter(name__in=names).values_list('name', 'pk'))
+
+    # update the charfield value to the enclosure id (string) so the subsequent
+    # AlterField to FK will find matching integer ids — one UPDATE per enclosure
+    for name, pk in existing.items():
+        Animal.objects.filter(enclosure=name).update(enclosure=str(pk))
 
 
 def _noop_reverse(apps, schema_editor):
@@ -38,7 +39,7 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.RunPython(_map_enclosure_strings_to_ids, _noop_reverse),
+        migrations.RunPython(_map_enclosure_strings_to_ids, _noop_reverse, elidable=True),
         migrations.AlterField(
             model_name='animal',
             name='enclosure',
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0008_merge_20251101_1535'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='animal',
+            name='last_fed_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='animal',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
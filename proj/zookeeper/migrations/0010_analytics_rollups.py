@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0009_animal_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('processed_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='previous_fed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='EnclosureSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('diet_type', models.CharField(choices=[('herbivore', 'Herbivore'), ('carnivore', 'Carnivore'), ('omnivore', 'Omnivore')], max_length=20)),
+                ('capacity', models.PositiveIntegerField()),
+                ('occupancy', models.PositiveIntegerField(default=0)),
+                ('hungry', models.PositiveIntegerField(default=0)),
+                ('feeds', models.PositiveIntegerField(default=0)),
+                ('enclosure', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='zookeeper.enclosure')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour', 'diet_type'], name='zookeeper_e_hour_64d093_idx')],
+                'constraints': [models.UniqueConstraint(fields=('enclosure', 'hour'), name='unique_enclosure_snapshot_hour')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SpeciesFeedingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('feeds', models.PositiveIntegerField(default=0)),
+                ('intervals', models.PositiveIntegerField(default=0)),
+                ('interval_seconds', models.FloatField(default=0)),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feeding_rollups', to='zookeeper.species')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('species', 'hour'), name='unique_species_rollup_hour')],
+            },
+        ),
+    ]
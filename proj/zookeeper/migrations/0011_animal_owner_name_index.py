@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0010_analytics_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['owner', 'name'], name='zookeeper_a_owner_i_a30a4b_idx'),
+        ),
+    ]
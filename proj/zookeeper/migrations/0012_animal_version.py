@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0011_animal_owner_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
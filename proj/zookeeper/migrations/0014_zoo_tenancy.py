@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0001_squashed_0013_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Zoo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+                ('domain', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+            ],
+        ),
+        migrations.RemoveConstraint(
+            model_name='enclosure',
+            name='unique_active_enclosure_name',
+        ),
+        migrations.RemoveConstraint(
+            model_name='species',
+            name='unique_active_species_name',
+        ),
+        migrations.RemoveIndex(
+            model_name='animal',
+            name='zookeeper_a_owner_i_a30a4b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='enclosuresnapshot',
+            name='zookeeper_e_hour_64d093_idx',
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='zoo',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AddField(
+            model_name='enclosure',
+            name='zoo',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AddField(
+            model_name='enclosuresnapshot',
+            name='zoo',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AddField(
+            model_name='species',
+            name='zoo',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AddField(
+            model_name='speciesfeedingrollup',
+            name='zoo',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+    ]
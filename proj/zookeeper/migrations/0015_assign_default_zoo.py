@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def assign_default_zoo(apps, schema_editor):
+    """Put every existing row in the default zoo with one UPDATE per table."""
+    Zoo = apps.get_model('zookeeper', 'Zoo')
+    zoo, _ = Zoo.objects.get_or_create(
+        slug=settings.ZOO_DEFAULT_TENANT, defaults={'name': settings.ZOO_DEFAULT_TENANT.title()}
+    )
+    for model in ('Species', 'Enclosure', 'Animal'):
+        apps.get_model('zookeeper', model).objects.filter(zoo__isnull=True).update(zoo=zoo)
+
+    # Rollups inherit the zoo of the row they summarise
+    Enclosure = apps.get_model('zookeeper', 'Enclosure')
+    Species = apps.get_model('zookeeper', 'Species')
+    apps.get_model('zookeeper', 'EnclosureSnapshot').objects.update(
+        zoo=Subquery(Enclosure.objects.filter(pk=OuterRef('enclosure_id')).values('zoo_id')[:1])
+    )
+    apps.get_model('zookeeper', 'SpeciesFeedingRollup').objects.update(
+        zoo=Subquery(Species.objects.filter(pk=OuterRef('species_id')).values('zoo_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0014_zoo_tenancy'),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_default_zoo, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0015_assign_default_zoo'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='animal',
+            name='zoo',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AlterField(
+            model_name='enclosure',
+            name='zoo',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AlterField(
+            model_name='enclosuresnapshot',
+            name='zoo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AlterField(
+            model_name='species',
+            name='zoo',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AlterField(
+            model_name='speciesfeedingrollup',
+            name='zoo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='zookeeper.zoo'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['zoo', 'owner', 'name'], name='zookeeper_a_zoo_id_47b5be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['zoo', 'enclosure'], name='zookeeper_a_zoo_id_0ae45a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['zoo', 'species'], name='zookeeper_a_zoo_id_0ccf41_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enclosure',
+            index=models.Index(fields=['zoo', 'diet_type'], name='zookeeper_e_zoo_id_5fcd99_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enclosuresnapshot',
+            index=models.Index(fields=['zoo', 'hour', 'diet_type'], name='zookeeper_e_zoo_id_7acec8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='speciesfeedingrollup',
+            index=models.Index(fields=['zoo', 'hour'], name='zookeeper_s_zoo_id_fe2f0e_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='enclosure',
+            constraint=models.UniqueConstraint(condition=models.Q(('archived_at__isnull', True)), fields=('zoo', 'name'), name='unique_active_enclosure_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='species',
+            constraint=models.UniqueConstraint(condition=models.Q(('archived_at__isnull', True)), fields=('zoo', 'name'), name='unique_active_species_name'),
+        ),
+    ]
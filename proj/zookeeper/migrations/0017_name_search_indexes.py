@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Admin/autocomplete search uses istartswith and iexact, which PostgreSQL runs
+# as UPPER(name::text) LIKE/= UPPER(...). A plain btree on name cannot serve
+# those; an UPPER(name) text_pattern_ops index (tenant-leading, like the other
+# indexes) serves both. Other backends are left alone.
+TABLES = ('zookeeper_animal', 'zookeeper_species', 'zookeeper_enclosure')
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{table}_zoo_name_upper" '
+            f'ON "{table}" ("zoo_id", UPPER("name") text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_zoo_name_upper"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zookeeper', '0016_zoo_required'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,32 +1,91 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 
+from .tenancy import ALL_ZOOS, TenantManagerMixin, tenant_cache_key
+
+class Zoo(models.Model):
+    """A park. Species, enclosures and animals all belong to exactly one zoo."""
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=50, unique=True)
+    # Requests for this host are served as this zoo (see TenantMiddleware)
+    domain = models.CharField(max_length=255, unique=True, null=True, blank=True)
+
+    def __str__(self):
+        return self.name
+
+class TenantManager(TenantManagerMixin, models.Manager):
+    pass
+
+# Soft delete: rows get archived_at instead of being deleted, default managers
+# hide them, and `manage.py purge_archived` removes them later in batches.
+class ActiveManager(TenantManager):
+    def get_queryset(self):
+        return super().get_queryset().filter(archived_at__isnull=True)
+
 class Species(models.Model):
     DIET_CHOICES = [
         ('herbivore', 'Herbivore'),
         ('carnivore', 'Carnivore'),
         ('omnivore', 'Omnivore'),
     ]
-    name = models.CharField(max_length=100, unique=True)
+    zoo = models.ForeignKey(Zoo, on_delete=models.CASCADE, editable=False)
+    name = models.CharField(max_length=100)
     diet = models.CharField(max_length=20, choices=DIET_CHOICES)
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return f"{self.name} ({self.get_diet_display()})"
 
+    def archive(self):
+        """Archive this species and its animals with two UPDATEs."""
+        now = timezone.now()
+        with transaction.atomic():
+            Species.objects.filter(pk=self.pk).update(archived_at=now)
+            Animal.objects.filter(species=self).archive(now)
+        self.archived_at = now
+
     class Meta:
         verbose_name_plural = "Species"
+        constraints = [
+            # Archived names can be reused straight away
+            models.UniqueConstraint(fields=['zoo', 'name'], condition=models.Q(archived_at__isnull=True), name='unique_active_species_name'),
+        ]
 
 class Enclosure(models.Model):
-    name = models.CharField(max_length=100, unique=True)
+    zoo = models.ForeignKey(Zoo, on_delete=models.CASCADE, editable=False)
+    name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     capacity = models.PositiveIntegerField(default=1)
     diet_type = models.CharField(max_length=20, choices=Species.DIET_CHOICES, help_text="Preferred diet type for this enclosure")
     created_at = models.DateTimeField(auto_now_add=True)
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['zoo', 'name'], condition=models.Q(archived_at__isnull=True), name='unique_active_enclosure_name'),
+        ]
+        indexes = [models.Index(fields=['zoo', 'diet_type'])]
 
     def __str__(self):
         return f"{self.name} ({self.get_diet_type_display()})"
 
+    def archive(self):
+        """Archive this enclosure and the animals in it with two UPDATEs."""
+        now = timezone.now()
+        with transaction.atomic():
+            Enclosure.objects.filter(pk=self.pk).update(archived_at=now)
+            Animal.objects.filter(enclosure=self).archive(now)
+        self.archived_at = now
+
     @property
     def current_occupancy(self):
         return self.animal_set.count()
@@ -35,19 +94,202 @@ class Enclosure(models.Model):
     def is_full(self):
         return self.current_occupancy >= self.capacity
 
+OWNED_IDS_CACHE_KEY = 'zookeeper:owned-animals:{}'
+
+
+def owned_ids_cache_key(user_id, zoo_id=None):
+    return tenant_cache_key(OWNED_IDS_CACHE_KEY.format(user_id), zoo_id)
+
+
+def invalidate_owned_ids(owners):
+    """
+    Drop the cached owned-id sets for (user_id, zoo_id) pairs: the zoo's own
+    entry and the cross-zoo one cached outside a request.
+    """
+    cache.delete_many([
+        key
+        for user_id, zoo_id in owners
+        for key in (owned_ids_cache_key(user_id, zoo_id), owned_ids_cache_key(user_id, ALL_ZOOS))
+    ])
+
+class AnimalQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        # Every signed-in keeper can browse the whole roster
+        return self.all()
+
+    def owned_by(self, user):
+        return self.filter(owner=user)
+
+    def editable_by(self, user):
+        # Owners can edit/feed their animals; staff can edit any
+        if user.is_staff:
+            return self.all()
+        return self.owned_by(user)
+
+    def archive(self, when=None):
+        """Set-based soft delete; returns the number of animals archived."""
+        when = when or timezone.now()
+        owners = set(self.values_list('owner_id', 'zoo_id').distinct())
+        archived = self.update(archived_at=when, updated_at=when, version=models.F('version') + 1)
+        # update() sends no signals, so drop the owners' cached id sets here
+        invalidate_owned_ids(owners)
+        return archived
+
+class AnimalManager(TenantManagerMixin, models.Manager.from_queryset(AnimalQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(archived_at__isnull=True)
+
+    def owned_ids(self, user):
+        """
+        Cached frozenset of the ids of `user`'s animals in the current zoo.
+        Invalidated by the Animal save/delete receivers in signals.py.
+        """
+        key = owned_ids_cache_key(user.pk)
+        ids = cache.get(key)
+        if ids is None:
+            ids = frozenset(self.owned_by(user).values_list('pk', flat=True))
+            cache.set(key, ids, getattr(settings, 'ZOO_OWNED_IDS_CACHE_TTL', 300))
+        return ids
+
+    def can_edit(self, user, pk):
+        return user.is_staff or int(pk) in self.owned_ids(user)
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a versioned write finds the row changed since it was read."""
+
 class Animal(models.Model):
+    zoo = models.ForeignKey(Zoo, on_delete=models.CASCADE, editable=False)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     species = models.ForeignKey(Species, on_delete=models.CASCADE)
     enclosure = models.ForeignKey(Enclosure, on_delete=models.CASCADE)
-    last_fed_at = models.DateTimeField(null=True, blank=True)
+    last_fed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Feeding before last_fed_at; lets the analytics rollup measure intervals
+    previous_fed_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Bumped on every write; versioned saves only apply if it is unchanged
+    version = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+
+    objects = AnimalManager()
+    all_objects = models.Manager.from_queryset(AnimalQuerySet)()
+
+    class Meta:
+        # Tenant-leading, so each park's queries only walk its own slice
+        indexes = [
+            models.Index(fields=['zoo', 'owner', 'name']),
+            models.Index(fields=['zoo', 'enclosure']),
+            models.Index(fields=['zoo', 'species']),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded owner so an ownership change can invalidate both users' caches
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
+
+    def archive(self):
+        """Archive this animal with one UPDATE (see AnimalQuerySet.archive)."""
+        now = timezone.now()
+        type(self).objects.filter(pk=self.pk).archive(now)
+        self.archived_at = now
+
+    def mark_fed(self, when=None):
+        self.previous_fed_at = self.last_fed_at
+        self.last_fed_at = when or timezone.now()
+
+    def save_versioned(self, fields):
+        """
+        Write only `fields` with UPDATE ... WHERE id = %s AND version = %s,
+        bumping the version. Raises ConcurrentUpdateError if another write
+        got there first, instead of silently overwriting it.
+        """
+        self.updated_at = timezone.now()
+        values = {name: getattr(self, name) for name in set(fields) | {'updated_at'}}
+        updated = type(self).objects.filter(pk=self.pk, version=self.version).update(
+            version=models.F('version') + 1, **values
+        )
+        if not updated:
+            raise ConcurrentUpdateError(f"{self} was changed by someone else")
+        self.version += 1
+        if 'owner' in fields:
+            # update() sends no signals; drop both owners' cached id sets
+            owners = {self.owner_id, getattr(self, '_loaded_owner_id', None)} - {None}
+            invalidate_owned_ids((pk, self.zoo_id) for pk in owners)
+
     @property
     def needs_feeding(self):
         if not self.last_fed_at:
             return True
-        return (timezone.now() - self.last_fed_at).total_seconds() > 24 * 3600
\ No newline at end of file
+        return (timezone.now() - self.last_fed_at).total_seconds() > 24 * 3600
+
+
+class ArchivedUser(models.Model):
+    """
+    Marks a keeper account removed through UserDeleteView. The account is
+    deactivated and its animals archived; purge_archived deletes it later.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='zoo_archive')
+    archived_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.user} (archived {self.archived_at:%Y-%m-%d})"
+
+    @classmethod
+    def archive(cls, user):
+        now = timezone.now()
+        with transaction.atomic():
+            user.is_active = False
+            user.save(update_fields=['is_active'])
+            cls.objects.update_or_create(user=user, defaults={'archived_at': now})
+            # Accounts are global, so archive their animals in every zoo, not just the current one
+            Animal.all_objects.filter(owner=user, archived_at__isnull=True).archive(now)
+
+
+# Analytics rollups — written only by `manage.py refresh_rollups`
+class EnclosureSnapshot(models.Model):
+    zoo = models.ForeignKey(Zoo, on_delete=models.CASCADE)
+    enclosure = models.ForeignKey(Enclosure, on_delete=models.CASCADE, related_name='snapshots')
+    hour = models.DateTimeField()
+    diet_type = models.CharField(max_length=20, choices=Species.DIET_CHOICES)
+    capacity = models.PositiveIntegerField()
+    occupancy = models.PositiveIntegerField(default=0)
+    hungry = models.PositiveIntegerField(default=0)
+    feeds = models.PositiveIntegerField(default=0)
+
+    objects = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['enclosure', 'hour'], name='unique_enclosure_snapshot_hour'),
+        ]
+        indexes = [models.Index(fields=['zoo', 'hour', 'diet_type'])]
+
+class SpeciesFeedingRollup(models.Model):
+    zoo = models.ForeignKey(Zoo, on_delete=models.CASCADE)
+    species = models.ForeignKey(Species, on_delete=models.CASCADE, related_name='feeding_rollups')
+    hour = models.DateTimeField()
+    feeds = models.PositiveIntegerField(default=0)
+    # Feeds with a known previous feeding, and the summed gap between the two
+    intervals = models.PositiveIntegerField(default=0)
+    interval_seconds = models.FloatField(default=0)
+
+    objects = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['species', 'hour'], name='unique_species_rollup_hour'),
+        ]
+        indexes = [models.Index(fields=['zoo', 'hour'])]
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    processed_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.processed_until}"
@@ -0,0 +1,45 @@
+# proj/zookeeper/paginator.py
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips the full COUNT(*) on big, unfiltered tables.
+
+    "Unfiltered" means no WHERE beyond the default manager's own (the
+    active-rows and current-zoo filters), i.e. no changelist filter or
+    search. On PostgreSQL the planner's row estimate for that query is used
+    once it passes `estimate_threshold`; filtered querysets and other
+    backends fall back to an exact count.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and self._is_unfiltered(self.object_list):
+            estimate = self._estimated_count(self.object_list)
+            if estimate is not None and estimate > self.estimate_threshold:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _is_unfiltered(queryset):
+        base = queryset.model._default_manager.get_queryset()
+        return queryset.query.where == base.query.where
+
+    @staticmethod
+    def _estimated_count(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        # Depending on the driver the plan arrives as [{...}] or as {...}
+        if isinstance(plan, list):
+            plan = plan[0]
+        rows = plan['Plan']['Plan Rows']
+        return rows if rows > 0 else None
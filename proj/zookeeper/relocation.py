@@ -0,0 +1,120 @@
+# proj/zookeeper/relocation.py
+import heapq
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Animal, Enclosure
+
+
+def _occupancy(enclosures, moving_ids):
+    """
+    Return {enclosure_pk: animals that will stay there}, computed with a
+    single aggregate query. Archived animals do not take up space, and
+    animals in the batch are not counted because they are about to leave
+    their current enclosure.
+    """
+    return dict(
+        enclosures.values('pk').annotate(
+            staying=Count('animal', filter=Q(animal__archived_at__isnull=True) & ~Q(animal__pk__in=moving_ids))
+        ).values_list('pk', 'staying')
+    )
+
+
+def _single_zoo(zoo_ids):
+    zoo_ids = set(zoo_ids)
+    if len(zoo_ids) > 1:
+        raise ValidationError("The selection contains animals from more than one zoo")
+    return zoo_ids.pop() if zoo_ids else None
+
+
+def relocate_animals(animals, target):
+    """
+    Move every animal in `animals` (a queryset) into the `target` enclosure.
+
+    Diet and capacity are checked once for the whole batch and the move is a
+    single UPDATE inside one transaction. Returns the number of animals moved.
+    """
+    with transaction.atomic():
+        # Lock the target so two concurrent moves cannot overfill it
+        target = Enclosure.objects.select_for_update().get(pk=target.pk)
+        ids = list(animals.values_list('pk', flat=True))
+        if not ids:
+            return 0
+
+        rows = set(
+            Animal.objects.filter(pk__in=ids)
+            .values_list('zoo_id', 'species__diet')
+            .distinct()
+        )
+        if _single_zoo(zoo_id for zoo_id, _ in rows) != target.zoo_id:
+            raise ValidationError(f"{target.name} belongs to a different zoo than the selection")
+        wrong = {diet for _, diet in rows} - {target.diet_type}
+        if wrong:
+            raise ValidationError(
+                f"{target.name} is designed for {target.get_diet_type_display()} animals, "
+                f"but the selection contains {', '.join(sorted(wrong))} animals"
+            )
+
+        staying = _occupancy(Enclosure.objects.filter(pk=target.pk), ids)[target.pk]
+        if staying + len(ids) > target.capacity:
+            raise ValidationError(
+                f"{target.name} has room for {max(target.capacity - staying, 0)} more animals, "
+                f"but {len(ids)} were selected"
+            )
+
+        return Animal.objects.filter(pk__in=ids).update(
+            enclosure=target, updated_at=timezone.now(), version=F('version') + 1
+        )
+
+
+def rebalance_animals(animals, enclosures=None):
+    """
+    Spread `animals` across enclosures matching their species' diet, always
+    filling the enclosure with the most remaining capacity first.
+
+    `enclosures` limits the candidate targets (defaults to all enclosures);
+    only those in the animals' zoo are used, and mixed-zoo batches are rejected.
+    Issues one UPDATE per target enclosure inside one transaction and returns
+    a {enclosure: number of animals placed there} mapping.
+    """
+    if enclosures is None:
+        enclosures = Enclosure.objects.all()
+
+    with transaction.atomic():
+        batch = list(animals.values_list('pk', 'species__diet', 'zoo_id').order_by('pk'))
+        if not batch:
+            return {}
+        zoo_id = _single_zoo(zoo for _, _, zoo in batch)
+        targets = list(enclosures.filter(zoo_id=zoo_id).select_for_update().order_by('pk'))
+        ids = [pk for pk, _, _ in batch]
+        staying = _occupancy(Enclosure.objects.filter(pk__in=[e.pk for e in targets]), ids)
+
+        # One max-heap of (remaining capacity) per diet zone
+        heaps = {}
+        for enc in targets:
+            remaining = enc.capacity - staying[enc.pk]
+            if remaining > 0:
+                heaps.setdefault(enc.diet_type, []).append((-remaining, enc.pk, enc))
+        for heap in heaps.values():
+            heapq.heapify(heap)
+
+        placements = {}
+        for pk, diet, _ in batch:
+            heap = heaps.get(diet)
+            if not heap:
+                raise ValidationError(
+                    f"Not enough free {diet} enclosure capacity to rebalance the selection"
+                )
+            remaining, enc_pk, enc = heapq.heappop(heap)
+            placements.setdefault(enc, []).append(pk)
+            if remaining + 1 < 0:
+                heapq.heappush(heap, (remaining + 1, enc_pk, enc))
+
+        now = timezone.now()
+        for enc, pks in placements.items():
+            Animal.objects.filter(pk__in=pks).update(enclosure=enc, updated_at=now, version=F('version') + 1)
+
+    return {enc: len(pks) for enc, pks in placements.items()}
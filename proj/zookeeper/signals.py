@@ -0,0 +1,19 @@
+# proj/zookeeper/signals.py
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth import user_cache_key
+from .models import Animal, invalidate_owned_ids
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Animal)
+def invalidate_owned_animal_ids(sender, instance, **kwargs):
+    owners = {instance.owner_id, getattr(instance, '_loaded_owner_id', None)} - {None}
+    invalidate_owned_ids((pk, instance.zoo_id) for pk in owners)
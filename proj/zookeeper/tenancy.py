@@ -0,0 +1,54 @@
+# proj/zookeeper/tenancy.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_current_zoo = ContextVar('current_zoo', default=None)
+
+
+def current_zoo():
+    """The Zoo serving this request (set by TenantMiddleware), or None outside a request."""
+    return _current_zoo.get()
+
+
+@contextmanager
+def use_zoo(zoo):
+    """Scope the tenant-aware managers to `zoo` for the duration of the block."""
+    token = _current_zoo.set(zoo)
+    try:
+        yield zoo
+    finally:
+        _current_zoo.reset(token)
+
+
+def default_zoo():
+    from .models import Zoo
+
+    zoo, _ = Zoo.objects.get_or_create(
+        slug=settings.ZOO_DEFAULT_TENANT, defaults={'name': settings.ZOO_DEFAULT_TENANT.title()}
+    )
+    return zoo
+
+
+# Namespace for entries cached with no zoo active, i.e. across every zoo
+ALL_ZOOS = 'all'
+
+
+def tenant_cache_key(key, zoo_id=None):
+    """Namespace `key` by zoo so parks sharing a cache never see each other's entries."""
+    if zoo_id is None:
+        zoo = current_zoo()
+        zoo_id = zoo.pk if zoo is not None else ALL_ZOOS
+    return f'zoo:{zoo_id}:{key}'
+
+
+class TenantManagerMixin:
+    """Default-manager mixin restricting querysets to the current zoo, when there is one."""
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        zoo = current_zoo()
+        if zoo is not None:
+            qs = qs.filter(zoo=zoo)
+        return qs
@@ -1,3 +1,441 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .analytics import COMMIT_LAG, feeding_intervals, refresh_rollups
+from .models import (
+    Animal, ConcurrentUpdateError, Enclosure, EnclosureSnapshot, Species, SpeciesFeedingRollup, Zoo,
+    owned_ids_cache_key,
+)
+from .relocation import rebalance_animals, relocate_animals
+from .tenancy import default_zoo, use_zoo
+
+
+class VersionedWriteConcurrencyTests(TransactionTestCase):
+    THREADS = 8
+
+    def setUp(self):
+        # Cached host->zoo and owned-id entries must not outlive the test database
+        cache.clear()
+        self.zoo = default_zoo()
+        self.owner = User.objects.create_user('keeper', password='keeper')
+        species = Species.objects.create(zoo=self.zoo, name='Zebra', diet='herbivore')
+        enclosure = Enclosure.objects.create(zoo=self.zoo, name='Savanna', diet_type='herbivore', capacity=5)
+        self.animal = Animal.objects.create(zoo=self.zoo, owner=self.owner, name='Marty', species=species, enclosure=enclosure)
+
+    def _hammer(self, action):
+        """Run `action` in THREADS threads that all read the animal before any of them writes."""
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+        lock = threading.Lock()
+
+        def worker(i):
+            try:
+                animal = Animal.objects.get(pk=self.animal.pk)
+                barrier.wait()
+                try:
+                    action(animal, i)
+                    outcome = 'ok'
+                except ConcurrentUpdateError:
+                    outcome = 'conflict'
+                with lock:
+                    results.append(outcome)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_feeds_apply_exactly_once(self):
+        def feed(animal, i):
+            animal.mark_fed()
+            animal.save_versioned(['last_fed_at', 'previous_fed_at'])
+
+        results = self._hammer(feed)
+
+        self.assertEqual(len(results), self.THREADS)
+        self.assertEqual(results.count('ok'), 1)
+        self.assertEqual(results.count('conflict'), self.THREADS - 1)
+        animal = Animal.objects.get(pk=self.animal.pk)
+        self.assertEqual(animal.version, 1)
+        self.assertIsNotNone(animal.last_fed_at)
+
+    def test_concurrent_edits_do_not_overwrite_each_other(self):
+        def rename(animal, i):
+            animal.name = f'Marty {i}'
+            animal.save_versioned(['name'])
+
+        results = self._hammer(rename)
+
+        self.assertEqual(results.count('ok'), 1)
+        animal = Animal.objects.get(pk=self.animal.pk)
+        self.assertEqual(animal.version, 1)
+        self.assertNotEqual(animal.name, 'Marty')
+
+    def test_versioned_save_touches_only_given_fields(self):
+        stale = Animal.objects.get(pk=self.animal.pk)
+        Animal.objects.filter(pk=self.animal.pk).update(name='Renamed elsewhere')
+
+        stale.mark_fed()
+        stale.save_versioned(['last_fed_at', 'previous_fed_at'])
+
+        animal = Animal.objects.get(pk=self.animal.pk)
+        self.assertEqual(animal.name, 'Renamed elsewhere')
+        self.assertEqual(animal.version, 1)
+
+    def test_update_view_reports_conflict(self):
+        self.client.force_login(self.owner)
+        # Someone else saves while this user has the form (version 0) open
+        other = Animal.objects.get(pk=self.animal.pk)
+        other.name = 'Edited'
+        other.save_versioned(['name'])
+
+        response = self.client.post(f'/animals/{self.animal.pk}/update/', {
+            'name': 'Mine', 'species': other.species_id, 'enclosure': other.enclosure_id, 'version': 0,
+        })
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Animal.objects.get(pk=self.animal.pk).name, 'Edited')
+
+
+class SoftDeleteViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.zoo = default_zoo()
+        self.owner = User.objects.create_user('keeper', password='keeper')
+        self.species = Species.objects.create(zoo=self.zoo, name='Zebra', diet='herbivore')
+        self.enclosure = Enclosure.objects.create(zoo=self.zoo, name='Savanna', diet_type='herbivore', capacity=5)
+        self.animal = Animal.objects.create(zoo=self.zoo, owner=self.owner, name='Marty', species=self.species, enclosure=self.enclosure)
+
+    def test_delete_view_archives_animal(self):
+        self.client.force_login(self.owner)
+
+        response = self.client.post(f'/animals/{self.animal.pk}/delete/')
+
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+        self.assertFalse(Animal.objects.filter(pk=self.animal.pk).exists())
+        self.assertIsNotNone(Animal.all_objects.get(pk=self.animal.pk).archived_at)
+
+    def test_admin_delete_archives(self):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'root')
+        self.client.force_login(admin_user)
+
+        response = self.client.post('/admin/zookeeper/enclosure/', {
+            'action': 'delete_selected', '_selected_action': [self.enclosure.pk], 'post': 'yes',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIsNotNone(Enclosure.all_objects.get(pk=self.enclosure.pk).archived_at)
+        self.assertIsNotNone(Animal.all_objects.get(pk=self.animal.pk).archived_at)
+
+    def test_admin_edit_losing_race_reports_conflict(self):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'root')
+        self.client.force_login(admin_user)
+        url = f'/admin/zookeeper/animal/{self.animal.pk}/change/'
+        save_versioned = Animal.save_versioned
+
+        def feed_first(animal, fields):
+            # Another keeper feeds the animal between form validation and the write
+            other = Animal.objects.get(pk=animal.pk)
+            other.mark_fed()
+            save_versioned(other, ['last_fed_at', 'previous_fed_at'])
+            return save_versioned(animal, fields)
+
+        with mock.patch.object(Animal, 'save_versioned', feed_first):
+            response = self.client.post(url, {
+                'name': 'Renamed', 'owner': self.owner.pk, 'species': self.species.pk,
+                'enclosure': self.enclosure.pk, 'version': 0,
+            }, follow=True)
+
+        self.assertRedirects(response, url)
+        self.assertContains(response, 'changed by someone else')
+        animal = Animal.objects.get(pk=self.animal.pk)
+        self.assertEqual(animal.name, 'Marty')
+        self.assertIsNotNone(animal.last_fed_at)
+
+    def test_duplicate_name_is_a_form_error(self):
+        staff = User.objects.create_user('admin', password='admin', is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.post('/species/create/', {'name': 'Zebra', 'diet': 'herbivore'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('name', response.context['form'].errors)
+        self.species.archive()
+        response = self.client.post('/species/create/', {'name': 'Zebra', 'diet': 'herbivore'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_invalid_autocomplete_value_rerenders_form(self):
+        self.client.force_login(self.owner)
+
+        response = self.client.post('/animals/create/', {'name': 'Stray', 'species': 'abc', 'enclosure': self.enclosure.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('species', response.context['form'].errors)
+
+    def test_archived_animals_free_their_space(self):
+        full = Enclosure.objects.create(zoo=self.zoo, name='Paddock', diet_type='herbivore', capacity=1)
+        gone = Animal.objects.create(zoo=self.zoo, owner=self.owner, name='Gloria', species=self.species, enclosure=full)
+        gone.archive()
+        self.client.force_login(self.owner)
+
+        self.assertFalse(full.is_full)
+        response = self.client.get('/autocomplete/enclosures/', {'q': 'Pad'})
+        self.assertEqual([r['id'] for r in response.json()['results']], [full.pk])
+        self.assertEqual(relocate_animals(Animal.objects.filter(pk=self.animal.pk), full), 1)
+
+
+@override_settings(ALLOWED_HOSTS=['testserver', '.zoo.test'])
+class TenantIsolationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('keeper', password='keeper')
+        self.north = Zoo.objects.create(name='North', slug='north', domain='north.zoo.test')
+        self.south = Zoo.objects.create(name='South', slug='south', domain='south.zoo.test')
+        # Same names in both parks: uniqueness is per zoo
+        self.animals = {}
+        for zoo in (self.north, self.south):
+            species = Species.objects.create(zoo=zoo, name='Zebra', diet='herbivore')
+            enclosure = Enclosure.objects.create(zoo=zoo, name='Savanna', diet_type='herbivore', capacity=5)
+            self.animals[zoo.slug] = Animal.objects.create(
+                zoo=zoo, owner=self.owner, name=f'{zoo.name} Marty', species=species, enclosure=enclosure)
+
+    def test_host_selects_zoo(self):
+        self.client.force_login(self.owner)
+
+        response = self.client.get('/', HTTP_HOST='north.zoo.test')
+        self.assertEqual([a.name for a in response.context['animals']], ['North Marty'])
+        self.assertEqual(response.wsgi_request.zoo, self.north)
+
+        # Unknown hosts are served as the default zoo
+        response = self.client.get('/')
+        self.assertEqual(response.wsgi_request.zoo, default_zoo())
+        self.assertEqual(list(response.context['animals']), [])
+
+    def test_managers_are_scoped_to_current_zoo(self):
+        with use_zoo(self.north):
+            self.assertEqual(list(Animal.objects.all()), [self.animals['north']])
+            self.assertEqual(Enclosure.objects.get(name='Savanna').zoo, self.north)
+            self.assertEqual(Animal.all_objects.count(), 2)
+        self.assertEqual(Animal.objects.count(), 2)
+
+    def test_names_are_unique_per_zoo(self):
+        with self.assertRaises(IntegrityError):
+            Species.objects.create(zoo=self.north, name='Zebra', diet='herbivore')
+
+    def test_owned_ids_cache_is_namespaced_by_zoo(self):
+        self.assertNotEqual(owned_ids_cache_key(self.owner.pk, self.north.pk),
+                            owned_ids_cache_key(self.owner.pk, self.south.pk))
+        with use_zoo(self.north):
+            self.assertEqual(Animal.objects.owned_ids(self.owner), {self.animals['north'].pk})
+        with use_zoo(self.south):
+            self.assertEqual(Animal.objects.owned_ids(self.owner), {self.animals['south'].pk})
+
+    def test_unscoped_owned_ids_are_invalidated(self):
+        other = User.objects.create_user('other')
+        self.assertEqual(Animal.objects.owned_ids(other), frozenset())
+
+        animal = self.animals['north']
+        animal.owner = other
+        animal.save_versioned(['owner'])
+
+        self.assertEqual(Animal.objects.owned_ids(other), {animal.pk})
+        self.assertEqual(Animal.objects.owned_ids(self.owner), {self.animals['south'].pk})
+
+    def test_other_zoo_animal_is_not_found(self):
+        self.client.force_login(self.owner)
+        south = self.animals['south']
+
+        self.assertEqual(self.client.get(f'/animals/{south.pk}/', HTTP_HOST='north.zoo.test').status_code, 404)
+        response = self.client.post(f'/animals/{south.pk}/feed/', HTTP_HOST='north.zoo.test')
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(Animal.objects.get(pk=south.pk).last_fed_at)
+
+    def test_form_rejects_other_zoo_enclosure(self):
+        self.client.force_login(self.owner)
+        north = self.animals['north']
+
+        response = self.client.post('/animals/create/', {
+            'name': 'Stray', 'species': north.species_id,
+            'enclosure': self.animals['south'].enclosure_id, 'version': 0,
+        }, HTTP_HOST='north.zoo.test')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('enclosure', response.context['form'].errors)
+        self.assertFalse(Animal.objects.filter(name='Stray').exists())
+
+    def test_deleting_user_archives_animals_in_every_zoo(self):
+        staff = User.objects.create_user('admin', password='admin', is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.post(f'/users/{self.owner.pk}/delete/', HTTP_HOST='north.zoo.test')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Animal.objects.filter(owner=self.owner).exists())
+        self.assertEqual(Animal.all_objects.filter(owner=self.owner, archived_at__isnull=False).count(), 2)
+
+    def test_relocation_stays_in_zoo(self):
+        north = Animal.objects.filter(pk=self.animals['north'].pk)
+        Enclosure.objects.create(zoo=self.south, name='Plains', diet_type='herbivore', capacity=50)
+
+        with self.assertRaises(ValidationError):
+            relocate_animals(north, self.animals['south'].enclosure)
+        with self.assertRaises(ValidationError):
+            rebalance_animals(Animal.objects.all())
+        placed = rebalance_animals(north)
+        self.assertEqual({enc.zoo_id for enc in placed}, {self.north.pk})
+
+    def test_move_command_is_scoped_by_zoo(self):
+        Enclosure.objects.create(zoo=self.south, name='Plains', diet_type='herbivore', capacity=50)
+        Enclosure.objects.create(zoo=self.north, name='Meadow', diet_type='herbivore', capacity=5)
+
+        call_command('move_animals', '--zoo', 'north', '--from', 'Savanna', '--to', 'Meadow', stdout=StringIO())
+        call_command('move_animals', '--zoo', 'north', '--animals', str(self.animals['north'].pk),
+                     '--rebalance', stdout=StringIO())
+
+        self.assertEqual(Animal.objects.get(pk=self.animals['north'].pk).enclosure.zoo, self.north)
+        self.assertEqual(Animal.objects.get(pk=self.animals['south'].pk).enclosure.name, 'Savanna')
+
+
+class RollupRefreshTests(TestCase):
+    def setUp(self):
+        # Half past, so feeds a few minutes either side stay in the same hour
+        self.now = timezone.now().replace(minute=30, second=0, microsecond=0)
+        self.hour = self.now.replace(minute=0)
+        zoo = default_zoo()
+        owner = User.objects.create_user('keeper')
+        self.species = Species.objects.create(zoo=zoo, name='Zebra', diet='herbivore')
+        self.enclosure = Enclosure.objects.create(zoo=zoo, name='Savanna', diet_type='herbivore', capacity=5)
+        self.animal = Animal.objects.create(
+            zoo=zoo, owner=owner, name='Marty', species=self.species, enclosure=self.enclosure)
+        self.other = Animal.objects.create(
+            zoo=zoo, owner=owner, name='Gloria', species=self.species, enclosure=self.enclosure)
+
+    def feed(self, animal, when):
+        Animal.objects.filter(pk=animal.pk).update(
+            previous_fed_at=F('last_fed_at'), last_fed_at=when, updated_at=when)
+
+    def snapshot_feeds(self, hour):
+        return EnclosureSnapshot.objects.filter(enclosure=self.enclosure, hour=hour).values_list('feeds', flat=True).first()
+
+    def test_feed_is_counted_once_across_refreshes(self):
+        self.feed(self.animal, self.now - timedelta(minutes=10))
+
+        self.assertEqual(refresh_rollups(self.now), 1)
+        self.assertEqual(refresh_rollups(self.now + timedelta(minutes=5)), 0)
+
+        self.assertEqual(self.snapshot_feeds(self.hour), 1)
+        self.assertEqual(SpeciesFeedingRollup.objects.get(species=self.species, hour=self.hour).feeds, 1)
+
+    def test_feed_inside_commit_lag_waits_for_next_refresh(self):
+        self.feed(self.animal, self.now - COMMIT_LAG / 2)
+
+        self.assertEqual(refresh_rollups(self.now), 0)
+        self.assertEqual(self.snapshot_feeds(self.hour), 0)
+
+        self.assertEqual(refresh_rollups(self.now + COMMIT_LAG), 1)
+        self.assertEqual(self.snapshot_feeds(self.hour), 1)
+
+    def test_feed_lands_on_the_hour_it_happened(self):
+        fed_at = self.now - timedelta(hours=3)
+        self.feed(self.animal, fed_at)
+
+        refresh_rollups(self.now)
+
+        earlier = EnclosureSnapshot.objects.get(enclosure=self.enclosure, hour=fed_at.replace(minute=0))
+        self.assertEqual((earlier.feeds, earlier.capacity, earlier.occupancy), (1, 0, 0))
+        self.assertEqual(self.snapshot_feeds(self.hour), 0)
+        self.assertTrue(SpeciesFeedingRollup.objects.filter(species=self.species, hour=fed_at.replace(minute=0)).exists())
+
+    def test_feeding_intervals_average_the_gaps(self):
+        # Gaps of 6h and 4h between feedings average to 5h
+        self.feed(self.animal, self.now - timedelta(hours=8))
+        self.feed(self.other, self.now - timedelta(hours=6))
+        refresh_rollups(self.now - timedelta(hours=5))
+        self.feed(self.animal, self.now - timedelta(hours=2))
+        self.feed(self.other, self.now - timedelta(hours=2))
+        refresh_rollups(self.now)
+
+        rows = feeding_intervals(self.now - timedelta(hours=12))
+
+        self.assertEqual(rows, [{'species': 'Zebra', 'feeds': 4, 'avg_hours_between_feeds': 5.0}])
+
+
+class RelocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.zoo = default_zoo()
+        self.owner = User.objects.create_user('keeper')
+        self.zebra = Species.objects.create(zoo=self.zoo, name='Zebra', diet='herbivore')
+        self.lion = Species.objects.create(zoo=self.zoo, name='Lion', diet='carnivore')
+        self.pen = Enclosure.objects.create(zoo=self.zoo, name='Pen', diet_type='herbivore', capacity=10)
+        self.herd = [self.add('Zebra %d' % i, self.zebra, self.pen) for i in range(3)]
+
+    def add(self, name, species, enclosure):
+        return Animal.objects.create(zoo=self.zoo, owner=self.owner, name=name, species=species, enclosure=enclosure)
+
+    def herd_qs(self):
+        return Animal.objects.filter(pk__in=[a.pk for a in self.herd])
+
+    def test_relocate_rejects_wrong_diet(self):
+        den = Enclosure.objects.create(zoo=self.zoo, name='Den', diet_type='carnivore', capacity=10)
+
+        with self.assertRaisesMessage(ValidationError, 'herbivore'):
+            relocate_animals(self.herd_qs(), den)
+        self.assertFalse(Animal.objects.filter(enclosure=den).exists())
+
+    def test_relocate_rejects_overfilling(self):
+        small = Enclosure.objects.create(zoo=self.zoo, name='Small', diet_type='herbivore', capacity=3)
+        self.add('Resident', self.zebra, small)
+
+        with self.assertRaisesMessage(ValidationError, 'room for 2 more'):
+            relocate_animals(self.herd_qs(), small)
+        self.assertEqual(Animal.objects.filter(enclosure=small).count(), 1)
+
+    def test_rebalance_fills_most_room_first(self):
+        roomy = Enclosure.objects.create(zoo=self.zoo, name='Roomy', diet_type='herbivore', capacity=6)
+        tight = Enclosure.objects.create(zoo=self.zoo, name='Tight', diet_type='herbivore', capacity=4)
+        for i in range(2):
+            self.add('Resident %d' % i, self.zebra, tight)
+        Enclosure.objects.create(zoo=self.zoo, name='Den', diet_type='carnivore', capacity=50)
+
+        placed = rebalance_animals(self.herd_qs(), Enclosure.objects.filter(pk__in=[roomy.pk, tight.pk]))
+
+        # Roomy has 6 free against Tight's 2, so it takes the whole herd
+        self.assertEqual(placed, {roomy: 3})
+
+    def test_rebalance_rejects_when_diet_zone_is_full(self):
+        self.add('Leo', self.lion, self.pen)
+
+        with self.assertRaisesMessage(ValidationError, 'carnivore'):
+            rebalance_animals(Animal.objects.all(), Enclosure.objects.filter(pk=self.pen.pk))
+
+    def test_admin_selection_reaches_move_page_via_session(self):
+        admin_user = User.objects.create_superuser('root', 'root@example.com', 'root')
+        target = Enclosure.objects.create(zoo=self.zoo, name='Target', diet_type='herbivore', capacity=10)
+        self.client.force_login(admin_user)
+
+        response = self.client.post('/admin/zookeeper/animal/', {
+            'action': 'move_selected', '_selected_action': [a.pk for a in self.herd[:2]],
+        })
+        self.assertRedirects(response, '/animals/move/', fetch_redirect_response=False)
+        self.assertContains(self.client.get('/animals/move/'), 'Move the 2 animals selected')
+
+        response = self.client.post('/animals/move/', {'use_selection': 'on', 'target': target.pk})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Animal.objects.filter(enclosure=target).count(), 2)
@@ -9,11 +9,17 @@ urlpatterns = [
     path('animals/<int:pk>/update/', views.AnimalUpdateView.as_view(), name='animal_update'),
     path('animals/<int:pk>/delete/', views.AnimalDeleteView.as_view(), name='animal_delete'),
     path('animals/<int:pk>/feed/', views.feed_view, name='animal_feed'),
+    path('animals/move/', views.AnimalBulkMoveView.as_view(), name='animal_bulk_move'),
+    # Autocomplete endpoints used by the animal form
+    path('autocomplete/species/', views.species_autocomplete, name='species_autocomplete'),
+    path('autocomplete/enclosures/', views.enclosure_autocomplete, name='enclosure_autocomplete'),
     # Map page
     path('map/', views.map_view, name='zoo_map'),
     
     # Admin URLs
     path('admin-dashboard/', views.AdminDashboardView.as_view(), name='admin_dashboard'),
+    path('analytics/', views.AnalyticsDashboardView.as_view(), name='analytics_dashboard'),
+    path('analytics.json', views.analytics_json, name='analytics_json'),
     
     # Species Management
     path('species/create/', views.SpeciesCreateView.as_view(), name='species_create'),
@@ -1,15 +1,22 @@
 # proj/zookeeper/views.py
+from datetime import timedelta
+
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, FormView
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
-from .forms import AnimalForm, SpeciesForm, CustomUserCreationForm, CustomUserChangeForm, EnclosureForm
-
-from .models import Animal, Species, Enclosure
+from django.core.exceptions import ValidationError
+from django.db.models import Count, F, Q
+from django.http import Http404, JsonResponse
+from .forms import AnimalForm, SpeciesForm, CustomUserCreationForm, CustomUserChangeForm, EnclosureForm, BulkMoveForm
+
+from .models import Animal, Species, Enclosure, ArchivedUser, ConcurrentUpdateError
+from .relocation import relocate_animals, rebalance_animals
+from .analytics import occupancy_by_diet, feeding_intervals
 from django.shortcuts import render
 
 
@@ -21,7 +28,7 @@ class AnimalListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         # Show all animals to users; editing/feeding is restricted elsewhere
-        qs = Animal.objects.all()
+        qs = Animal.objects.visible_to(self.request.user)
         species = self.request.GET.get('species')
         enclosure = self.request.GET.get('enclosure')
         q = self.request.GET.get('q')
@@ -49,76 +56,146 @@ class AnimalDetailView(LoginRequiredMixin, DetailView):
 
     def get_queryset(self):
         # Allow viewing details of any animal; actions are permission-checked in templates and views
-        return Animal.objects.all().select_related('species', 'enclosure', 'owner')
+        return Animal.objects.visible_to(self.request.user).select_related('species', 'enclosure', 'owner')
 
 
 # 3️⃣ Create / Update / Delete Views — generic CBVs
-class AnimalCreateView(LoginRequiredMixin, CreateView):
+class ZooCreateMixin:
+    """CreateView that puts the new object in the zoo serving the request."""
+
+    def form_valid(self, form):
+        form.instance.zoo = self.request.zoo
+        return super().form_valid(form)
+
+
+class AnimalCreateView(LoginRequiredMixin, ZooCreateMixin, CreateView):
     model = Animal
     form_class=AnimalForm
     template_name = 'Zoo/animal_form.html'
     success_url = reverse_lazy('animals_list')
     extra_context = {'form_title': 'Add New Animal'}
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        ctx['enclosure_list'] = Enclosure.objects.all()
-        ctx['species_list'] = Species.objects.all()
-        return ctx
-
     def form_valid(self, form):
         form.instance.owner = self.request.user
         return super().form_valid(form)
 
 
-class AnimalUpdateView(LoginRequiredMixin, UpdateView):
+class AnimalEditableMixin:
+    """Reject animals the user may not edit from the cached owned-id set, before any query."""
+
+    def get_object(self, queryset=None):
+        if not Animal.objects.can_edit(self.request.user, self.kwargs['pk']):
+            raise Http404("No animal found matching the query")
+        return super().get_object(queryset)
+
+    def get_queryset(self):
+        return Animal.objects.editable_by(self.request.user)
+
+
+class AnimalUpdateView(LoginRequiredMixin, AnimalEditableMixin, UpdateView):
     model = Animal
-    fields = ['name', 'species', 'enclosure']
+    form_class = AnimalForm
     template_name = 'Zoo/animal_form.html'
     success_url = reverse_lazy('animals_list')
 
-    def get_queryset(self):
-        # Owners can edit their animals; staff can edit any
-        if self.request.user.is_staff:
-            return Animal.objects.all()
-        return Animal.objects.filter(owner=self.request.user)
+    def form_valid(self, form):
+        # Write only what the user changed, and only if nobody saved in between
+        changed = [name for name in form.changed_data if name != 'version']
+        if changed:
+            try:
+                form.instance.save_versioned(changed)
+            except ConcurrentUpdateError:
+                form.add_error(None, "This animal was changed by someone else while you were editing. "
+                                     "Reload the page to see the latest version.")
+                response = self.form_invalid(form)
+                response.status_code = 409
+                return response
+        return redirect(self.get_success_url())
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx.setdefault('form_title', 'Edit Animal')
-        ctx['enclosure_list'] = Enclosure.objects.all()
-        ctx['species_list'] = Species.objects.all()
         return ctx
 
 
-class AnimalDeleteView(LoginRequiredMixin, DeleteView):
+class ArchiveOnDeleteMixin:
+    """
+    DeleteView that archives the object (and its animals, set-based) instead
+    of running the CASCADE collector; `manage.py purge_archived` deletes later.
+    """
+
+    def form_valid(self, form):
+        self.object.archive()
+        return redirect(self.get_success_url())
+
+
+class AnimalDeleteView(LoginRequiredMixin, AnimalEditableMixin, ArchiveOnDeleteMixin, DeleteView):
     model = Animal
     template_name = 'Zoo/confirm_delete.html'
     success_url = reverse_lazy('animals_list')
 
-    def get_queryset(self):
-        if self.request.user.is_staff:
-            return Animal.objects.all()
-        return Animal.objects.filter(owner=self.request.user)
-
 
 # 4️⃣ Feed View — POST only
 @require_POST
 @login_required
 def feed_view(request, pk):
     # Allow only the owner or staff to mark an animal as fed
-    if request.user.is_staff:
-        animal = get_object_or_404(Animal, pk=pk)
-    else:
-        animal = get_object_or_404(Animal, pk=pk, owner=request.user)
-    animal.last_fed_at = timezone.now()
-    animal.save()
+    if not Animal.objects.can_edit(request.user, pk):
+        raise Http404("No animal found matching the query")
+    animal = get_object_or_404(Animal, pk=pk)
+    animal.mark_fed()
+    try:
+        animal.save_versioned(['last_fed_at', 'previous_fed_at'])
+    except ConcurrentUpdateError:
+        animal.refresh_from_db()
+        context = {'animal': animal, 'conflict': "Someone else updated this animal at the same time; it was not marked as fed."}
+        return render(request, 'Zoo/animal_detail.html', context, status=409)
     return redirect('animal_detail', pk=pk)
 
 
 from django.contrib.auth.decorators import login_required
 
 
+# Autocomplete endpoints for AnimalForm — prefix search, capped result size
+AUTOCOMPLETE_LIMIT = 20
+
+
+def _autocomplete_response(queryset, request):
+    q = request.GET.get('q', '').strip()
+    if q:
+        queryset = queryset.filter(name__istartswith=q)
+    results = [
+        {'id': obj.pk, 'text': str(obj)}
+        for obj in queryset.order_by('name')[:AUTOCOMPLETE_LIMIT]
+    ]
+    return JsonResponse({'results': results})
+
+
+@login_required
+def species_autocomplete(request):
+    return _autocomplete_response(Species.objects.all(), request)
+
+
+@login_required
+def enclosure_autocomplete(request):
+    """
+    Suggest enclosures with free space (any enclosure with ?any=1); when
+    ?species=<pk> is given, only those matching the species' diet, so the
+    form's checks will pass.
+    """
+    enclosures = Enclosure.objects.all()
+    if request.GET.get('any') != '1':
+        enclosures = enclosures.annotate(
+            occupancy=Count('animal', filter=Q(animal__archived_at__isnull=True))
+        ).filter(capacity__gt=F('occupancy'))
+    species = request.GET.get('species')
+    if species and species.isdigit():
+        diet = Species.objects.filter(pk=species).values_list('diet', flat=True).first()
+        if diet:
+            enclosures = enclosures.filter(diet_type=diet)
+    return _autocomplete_response(enclosures, request)
+
+
 # 5️⃣ Simple Map View — custom rectangular map grouped by diet
 @login_required
 def map_view(request):
@@ -128,7 +205,7 @@ def map_view(request):
     Shows only the current user's animals, grouped by species.diet.
     """
     animals = (
-        Animal.objects.filter(owner=request.user)
+        Animal.objects.owned_by(request.user)
         .select_related('species')
         .order_by('name')
     )
@@ -161,12 +238,12 @@ class AdminDashboardView(AdminRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context['animals'] = Animal.objects.all().select_related('species', 'owner', 'enclosure')
         context['species_list'] = Species.objects.all()
-        context['users'] = User.objects.all()
+        context['users'] = User.objects.filter(zoo_archive__isnull=True)
         context['enclosures'] = Enclosure.objects.all()
         return context
 
 # Species Management Views
-class SpeciesCreateView(AdminRequiredMixin, CreateView):
+class SpeciesCreateView(AdminRequiredMixin, ZooCreateMixin, CreateView):
     model = Species
     form_class = SpeciesForm
     template_name = 'Zoo/animal_form.html'
@@ -183,7 +260,7 @@ class SpeciesUpdateView(AdminRequiredMixin, UpdateView):
         ctx.setdefault('form_title', 'Edit Species')
         return ctx
 
-class SpeciesDeleteView(AdminRequiredMixin, DeleteView):
+class SpeciesDeleteView(AdminRequiredMixin, ArchiveOnDeleteMixin, DeleteView):
     model = Species
     template_name = 'Zoo/confirm_delete.html'
     success_url = reverse_lazy('admin_dashboard')
@@ -211,8 +288,13 @@ class UserDeleteView(AdminRequiredMixin, DeleteView):
     template_name = 'Zoo/confirm_delete.html'
     success_url = reverse_lazy('admin_dashboard')
 
+    def form_valid(self, form):
+        # Deactivate and archive; the account row is purged later
+        ArchivedUser.archive(self.object)
+        return redirect(self.get_success_url())
+
 # Enclosure Management Views
-class EnclosureCreateView(AdminRequiredMixin, CreateView):
+class EnclosureCreateView(AdminRequiredMixin, ZooCreateMixin, CreateView):
     model = Enclosure
     form_class = EnclosureForm
     template_name = 'Zoo/animal_form.html'
@@ -229,7 +311,69 @@ class EnclosureUpdateView(AdminRequiredMixin, UpdateView):
         ctx.setdefault('form_title', 'Edit Enclosure')
         return ctx
 
-class EnclosureDeleteView(AdminRequiredMixin, DeleteView):
+class EnclosureDeleteView(AdminRequiredMixin, ArchiveOnDeleteMixin, DeleteView):
     model = Enclosure
     template_name = 'Zoo/confirm_delete.html'
     success_url = reverse_lazy('admin_dashboard')
+
+# Bulk relocation — move a selection or a whole enclosure in one transaction
+# The admin "move selected" action leaves its selection here; a query string
+# would outgrow URL limits when a whole herd is selected
+BULK_MOVE_SESSION_KEY = 'zookeeper:bulk-move-ids'
+
+
+class AnimalBulkMoveView(AdminRequiredMixin, FormView):
+    form_class = BulkMoveForm
+    template_name = 'Zoo/animal_form.html'
+    success_url = reverse_lazy('admin_dashboard')
+    extra_context = {'form_title': 'Move Animals'}
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['selection'] = self.request.session.get(BULK_MOVE_SESSION_KEY, ())
+        return kwargs
+
+    def form_valid(self, form):
+        animals = form.get_animals()
+        try:
+            if form.cleaned_data['rebalance']:
+                rebalance_animals(animals)
+            else:
+                relocate_animals(animals, form.cleaned_data['target'])
+        except ValidationError as e:
+            form.add_error(None, e)
+            return self.form_invalid(form)
+        self.request.session.pop(BULK_MOVE_SESSION_KEY, None)
+        return super().form_valid(form)
+
+# Analytics — reads only the rollup tables filled by `manage.py refresh_rollups`
+ANALYTICS_MAX_HOURS = 24 * 90
+
+
+def _analytics_since(request):
+    hours = request.GET.get('hours', '')
+    hours = min(int(hours), ANALYTICS_MAX_HOURS) if hours.isdigit() else 48
+    return hours, timezone.now() - timedelta(hours=hours)
+
+
+class AnalyticsDashboardView(AdminRequiredMixin, TemplateView):
+    template_name = 'Zoo/analytics.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        hours, since = _analytics_since(self.request)
+        context['hours'] = hours
+        context['occupancy'] = occupancy_by_diet(since)
+        context['feeding'] = feeding_intervals(since)
+        return context
+
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def analytics_json(request):
+    hours, since = _analytics_since(request)
+    return JsonResponse({
+        'hours': hours,
+        'occupancy': occupancy_by_diet(since),
+        'feeding': feeding_intervals(since),
+    })